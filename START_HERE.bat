@@ -8,7 +8,10 @@ echo sunrise and sunset times in your location.
 echo.
 
 REM Check if already configured
-if exist camera_config.json (
+set CONFIGURED=0
+if exist camera_config.db set CONFIGURED=1
+if exist camera_config.json set CONFIGURED=1
+if "%CONFIGURED%"=="1" (
     echo Your camera is already configured!
     echo.
     echo What would you like to do?
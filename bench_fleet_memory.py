@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# pyright: ignore-all
+# mypy: ignore-missing-imports
+# pylint: disable=import-error
+"""
+Memory Benchmark for the Fleet Model
+Reports bytes per camera for the compact fleet model versus an approximation of
+the previous one-controller-per-camera layout
+Usage: python bench_fleet_memory.py [camera_count] [site_count] [cameras_per_nvr]
+"""
+
+import sys
+import gc
+import importlib
+import tracemalloc
+from types import SimpleNamespace
+
+from fleet import Fleet, SessionPool
+
+
+def make_camera_config(i, site_count, cameras_per_nvr):
+    """Synthetic camera entry in the same shape as camera_config.json
+
+    Cameras are grouped behind NVRs: each group shares one ip:port, site and
+    login, and is told apart by channel.
+    """
+    nvr = i // cameras_per_nvr
+    site = nvr % site_count
+    return {
+        'camera': {
+            'ip': f"10.{(nvr >> 16) & 255}.{(nvr >> 8) & 255}.{nvr & 255}",
+            'port': 80,
+            'channel': i % cameras_per_nvr,
+            'username': 'admin',
+            'password': f"site{site}-secret",
+        },
+        'location': {
+            'name': f"Site {site}",
+            'timezone': 'America/Denver',
+            'latitude': 39.7392 + site * 0.01,
+            'longitude': -104.9903 - site * 0.01,
+        },
+        'offsets': {'sunrise': 0, 'sunset': 0},
+        'profiles': {'day': 0, 'night': 1},
+    }
+
+
+def measure(build, configs):
+    """Return (bytes allocated, result) for building the model from configs"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(configs)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def build_compact(configs):
+    fleet = Fleet()
+    pool = SessionPool()
+    with_sessions = sessions_available()
+    for cfg in configs:
+        cam = cfg['camera']
+        offsets = cfg['offsets']
+        profiles = cfg['profiles']
+        fleet.add_camera(cam['ip'], cam['port'], cam['username'], cam['password'],
+                         cfg['location'], offsets['sunrise'], offsets['sunset'],
+                         profiles['day'], profiles['night'], cam['channel'])
+        if with_sessions:
+            # The pool hands every channel on the same NVR the same session
+            pool.get(cam['ip'], cam['port'], cam['username'], cam['password'])
+    return fleet, pool
+
+
+def build_legacy(configs):
+    """Approximate the previous layout with the per-camera state it used to hold
+
+    dahua_daynight.py loads its configuration on import, so the old controller
+    is modelled here rather than instantiated: a config dict, a SimpleNamespace,
+    a base URL, the firmware line and a Session with its own digest auth.
+    """
+    cameras = []
+    with_sessions = sessions_available()
+    for i, cfg in enumerate(configs):
+        cam = cfg['camera']
+        entry = {
+            'camera_ip': cam['ip'],
+            'camera_port': cam['port'],
+            'username': cam['username'],
+            'password': cam['password'],
+            'location': SimpleNamespace(**cfg['location']),
+            'channel': cam['channel'],
+            'base_url': f"http://{cam['ip']}:{cam['port']}",
+            # Each camera reported (and kept) its own firmware line
+            'firmware_info': f"Build:2023-01-01 Version:2.800.{i:07d}.0.R",
+        }
+        if with_sessions:
+            requests = importlib.import_module("requests")
+            auth_mod = importlib.import_module("requests.auth")
+            entry['session'] = requests.Session()
+            entry['session'].auth = auth_mod.HTTPDigestAuth(cam['username'], cam['password'])
+        cameras.append(entry)
+    return cameras
+
+
+def sessions_available():
+    try:
+        importlib.import_module("requests")
+        return True
+    except ImportError:
+        return False
+
+
+def main():
+    try:
+        camera_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+        site_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+        cameras_per_nvr = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    except ValueError:
+        camera_count = site_count = cameras_per_nvr = 0
+    if min(camera_count, site_count, cameras_per_nvr) < 1:
+        print("All counts must be whole numbers of at least 1.")
+        print(__doc__.strip().splitlines()[-1])
+        return 1
+
+    # Configs are built before measuring so only the in-memory model is counted
+    configs = [make_camera_config(i, site_count, cameras_per_nvr) for i in range(camera_count)]
+
+    compact_bytes, (fleet, pool) = measure(build_compact, configs)
+    legacy_bytes, legacy = measure(build_legacy, configs)
+
+    print(f"Cameras: {camera_count}  Sites: {len(fleet.sites)}  Sessions: {len(pool)}")
+    if not sessions_available():
+        print("Note: 'requests' is not installed; session memory is excluded from both figures")
+    print(f"Compact fleet model:       {compact_bytes / camera_count:10.1f} bytes/camera")
+    print(f"Previous layout (approx.): {legacy_bytes / camera_count:10.1f} bytes/camera")
+
+    pool.close()
+    del legacy
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
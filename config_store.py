@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# pyright: ignore-all
+# mypy: ignore-missing-imports
+# pylint: disable=import-error
+"""
+Indexed Configuration Store for Dahua Day/Night Automation
+Keeps camera settings in SQLite so large fleets load lazily, one camera at a time.
+The original camera_config.json format is still supported for import/export.
+
+Usage:
+    python config_store.py import camera_config.json
+    python config_store.py export camera_config.json
+"""
+
+import json
+import os
+import sys
+import logging
+import sqlite3
+
+from fleet import Fleet
+
+# Configuration files
+CONFIG_DB = "camera_config.db"
+LEGACY_CONFIG_FILE = "camera_config.json"
+MIGRATED_CONFIG_FILE = LEGACY_CONFIG_FILE + ".migrated"
+
+# Id used for the single camera configured by interactive_setup.py
+DEFAULT_CAMERA_ID = "default"
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cameras (
+    id    TEXT PRIMARY KEY,
+    site  TEXT NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cameras_site ON cameras (site);
+"""
+
+
+class ConfigError(ValueError):
+    """Raised when a camera entry is missing fields or has invalid values"""
+
+
+def _require(mapping, key, kind, where):
+    if not isinstance(mapping, dict) or key not in mapping:
+        raise ConfigError(f"missing '{where}.{key}'")
+    value = mapping[key]
+    # bool is an int subclass; never accept it where a number is expected
+    if isinstance(value, bool) or not isinstance(value, kind):
+        raise ConfigError(f"'{where}.{key}' has invalid value {value!r}")
+    return value
+
+
+def validate_entry(entry):
+    """Check one camera entry (camera_config.json shape) and return flat settings"""
+    if not isinstance(entry, dict):
+        raise ConfigError("camera entry must be an object")
+
+    camera = entry.get('camera')
+    location = entry.get('location')
+    offsets = entry.get('offsets', {'sunrise': 0, 'sunset': 0})
+    profiles = entry.get('profiles', {'day': 0, 'night': 1})
+
+    port = camera.get('port', 80) if isinstance(camera, dict) else 80
+    if isinstance(port, bool) or not isinstance(port, int) or not 0 < port < 65536:
+        raise ConfigError(f"'camera.port' has invalid value {port!r}")
+
+    # Channel on the device; only cameras behind an NVR need to set it
+    channel = camera.get('channel', 0) if isinstance(camera, dict) else 0
+    if isinstance(channel, bool) or not isinstance(channel, int) or channel < 0:
+        raise ConfigError(f"'camera.channel' has invalid value {channel!r}")
+
+    return {
+        'camera_ip': _require(camera, 'ip', str, 'camera'),
+        'camera_port': port,
+        'camera_channel': channel,
+        'username': _require(camera, 'username', str, 'camera'),
+        'password': _require(camera, 'password', str, 'camera'),
+        'location': {
+            'name': _require(location, 'name', str, 'location'),
+            'timezone': _require(location, 'timezone', str, 'location'),
+            'latitude': _require(location, 'latitude', (int, float), 'location'),
+            'longitude': _require(location, 'longitude', (int, float), 'location'),
+        },
+        'sunrise_offset': _require(offsets, 'sunrise', int, 'offsets'),
+        'sunset_offset': _require(offsets, 'sunset', int, 'offsets'),
+        'day_profile': _require(profiles, 'day', int, 'profiles'),
+        'night_profile': _require(profiles, 'night', int, 'profiles'),
+    }
+
+
+def site_of(entry):
+    """Site key used to index an entry (the location name)"""
+    location = entry.get('location') if isinstance(entry, dict) else None
+    if isinstance(location, dict) and isinstance(location.get('name'), str):
+        return location['name']
+    return ""
+
+
+class ConfigStore:
+    """SQLite-backed camera configuration indexed by camera id and site"""
+
+    def __init__(self, path=CONFIG_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM cameras").fetchone()[0]
+
+    def __contains__(self, camera_id):
+        row = self.conn.execute("SELECT 1 FROM cameras WHERE id = ?", (camera_id,)).fetchone()
+        return row is not None
+
+    def camera_ids(self, site=None):
+        """Ids of all cameras, optionally limited to one site"""
+        if site is None:
+            cursor = self.conn.execute("SELECT id FROM cameras ORDER BY id")
+        else:
+            cursor = self.conn.execute("SELECT id FROM cameras WHERE site = ? ORDER BY id", (site,))
+        return [row[0] for row in cursor]
+
+    def sites(self):
+        """Names of all sites that have at least one camera"""
+        cursor = self.conn.execute("SELECT DISTINCT site FROM cameras ORDER BY site")
+        return [row[0] for row in cursor]
+
+    def get_entry(self, camera_id):
+        """Raw (unvalidated) entry for one camera, or None if it does not exist"""
+        row = self.conn.execute("SELECT entry FROM cameras WHERE id = ?", (camera_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_camera(self, camera_id):
+        """Validated settings for one camera; raises ConfigError if missing or invalid"""
+        try:
+            entry = self.get_entry(camera_id)
+        except ValueError as exc:
+            raise ConfigError(f"camera '{camera_id}' is not valid JSON: {exc}") from exc
+        if entry is None:
+            raise ConfigError(f"camera '{camera_id}' not found")
+        return validate_entry(entry)
+
+    def iter_cameras(self, site=None):
+        """Yield (camera_id, settings) lazily, skipping entries that fail validation"""
+        if site is None:
+            cursor = self.conn.execute("SELECT id, entry FROM cameras ORDER BY id")
+        else:
+            cursor = self.conn.execute("SELECT id, entry FROM cameras WHERE site = ? ORDER BY id", (site,))
+        for camera_id, raw in cursor:
+            try:
+                yield camera_id, validate_entry(json.loads(raw))
+            except ValueError as exc:
+                logger.warning(f"Skipping camera '{camera_id}': {exc}")
+
+    def put_camera(self, camera_id, entry):
+        """Insert or replace a single camera entry without touching the others"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cameras (id, site, entry) VALUES (?, ?, ?)",
+                (camera_id, site_of(entry), json.dumps(entry)),
+            )
+
+    def delete_camera(self, camera_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM cameras WHERE id = ?", (camera_id,))
+
+    def import_json(self, path):
+        """Import a JSON config; returns the number of cameras stored
+
+        Accepts the single-camera camera_config.json written by interactive_setup.py
+        (stored as DEFAULT_CAMERA_ID) or a fleet file of the form
+        {"cameras": {"<id>": <entry>, ...}}. Entries are stored as-is and
+        validated when they are loaded.
+        """
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        if isinstance(data, dict) and isinstance(data.get('cameras'), dict):
+            entries = data['cameras'].items()
+        else:
+            entries = [(DEFAULT_CAMERA_ID, data)]
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cameras (id, site, entry) VALUES (?, ?, ?)",
+                ((str(camera_id), site_of(entry), json.dumps(entry)) for camera_id, entry in entries),
+            )
+        return len(entries)
+
+    def export_json(self, path):
+        """Write every camera to a fleet JSON file; returns the number exported"""
+        cursor = self.conn.execute("SELECT id, entry FROM cameras ORDER BY id")
+        count = 0
+        with open(path, 'w') as f:
+            # Stream one entry at a time so exports never hold the whole fleet in memory
+            f.write('{\n    "cameras": {')
+            for camera_id, raw in cursor:
+                f.write(',' if count else '')
+                f.write(f"\n        {json.dumps(camera_id)}: {raw}")
+                count += 1
+            f.write('\n    }\n}\n')
+        return count
+
+    def load_fleet(self, site=None):
+        """Build a compact Fleet from the valid cameras, optionally for one site"""
+        fleet = Fleet()
+        for _, settings in self.iter_cameras(site):
+            fleet.add_camera(
+                settings['camera_ip'], settings['camera_port'],
+                settings['username'], settings['password'], settings['location'],
+                settings['sunrise_offset'], settings['sunset_offset'],
+                settings['day_profile'], settings['night_profile'],
+                settings['camera_channel'],
+            )
+        return fleet
+
+
+def config_exists():
+    """True if either the SQLite store or a legacy JSON config is present"""
+    return os.path.exists(CONFIG_DB) or os.path.exists(LEGACY_CONFIG_FILE)
+
+
+def retire_legacy_json(count, path=CONFIG_DB):
+    """Rename camera_config.json after it has been imported so it is not mistaken for the live config"""
+    try:
+        os.replace(LEGACY_CONFIG_FILE, MIGRATED_CONFIG_FILE)
+        logger.warning(f"Imported {count} camera(s) from {LEGACY_CONFIG_FILE} into {path}; "
+                       f"the JSON file was renamed to {MIGRATED_CONFIG_FILE}")
+    except OSError as exc:
+        logger.warning(f"Imported {count} camera(s) from {LEGACY_CONFIG_FILE} into {path}, "
+                       f"but could not rename it ({exc}). {LEGACY_CONFIG_FILE} is now ignored; "
+                       f"edit settings with interactive_setup.py or config_store.py instead")
+
+
+def _install(tmp_path, path):
+    """Move a finished database into place; returns False if another process got there first"""
+    try:
+        if os.name == 'nt':
+            # Windows rename refuses to overwrite an existing file
+            os.rename(tmp_path, path)
+        else:
+            # link() refuses to overwrite, unlike rename() on POSIX
+            os.link(tmp_path, path)
+            os.remove(tmp_path)
+        return True
+    except FileExistsError:
+        os.remove(tmp_path)
+        return False
+
+
+def open_store(path=CONFIG_DB):
+    """Open the config store, importing a legacy camera_config.json on first use
+
+    The import is built in a private temporary database and only moved into
+    place if no other process has migrated in the meantime, so concurrent
+    starts never see, or delete, each other's database. After a successful
+    import the JSON file is renamed to camera_config.json.migrated.
+    """
+    if os.path.exists(path) or not os.path.exists(LEGACY_CONFIG_FILE):
+        return ConfigStore(path)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    store = ConfigStore(tmp_path)
+    try:
+        count = store.import_json(LEGACY_CONFIG_FILE)
+    except Exception:
+        store.close()
+        os.remove(tmp_path)
+        # The JSON may have vanished because another process just migrated it
+        if os.path.exists(path):
+            return ConfigStore(path)
+        raise
+    store.close()
+
+    if _install(tmp_path, path):
+        retire_legacy_json(count, path)
+    return ConfigStore(path)
+
+
+def main():
+    if len(sys.argv) != 3 or sys.argv[1] not in ('import', 'export'):
+        print(__doc__.strip())
+        return 1
+
+    action, path = sys.argv[1], sys.argv[2]
+    if action == 'export' and not config_exists():
+        print(f"ERROR: No configuration found ({CONFIG_DB} or {LEGACY_CONFIG_FILE}); nothing to export.")
+        return 1
+
+    is_legacy = os.path.normcase(os.path.abspath(path)) == os.path.normcase(os.path.abspath(LEGACY_CONFIG_FILE))
+
+    try:
+        if action == 'import' and is_legacy:
+            # Importing camera_config.json itself is the migration; skip the automatic one
+            with ConfigStore() as store:
+                count = store.import_json(path)
+            print(f"Imported {count} camera(s) from {path}")
+            retire_legacy_json(count)
+            return 0
+
+        # open_store() imports a legacy camera_config.json first so it is never dropped
+        with open_store() as store:
+            if action == 'import':
+                count = store.import_json(path)
+                print(f"Imported {count} camera(s) from {path}")
+            else:
+                count = store.export_json(path)
+                print(f"Exported {count} camera(s) to {path}")
+    except Exception as e:
+        print(f"ERROR: {action} failed: {str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
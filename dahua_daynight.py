@@ -7,82 +7,40 @@ Dahua Camera Day/Night Mode Automation Script
 Automatically switches between day and night modes based on sunrise/sunset times
 """
 
-import requests
-from requests.auth import HTTPDigestAuth
-import json
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 import sys
-import os
 import importlib
-from types import SimpleNamespace
 
-# Configuration file
-CONFIG_FILE = "camera_config.json"
+from config_store import DEFAULT_CAMERA_ID, config_exists, open_store
+from fleet import SESSION_POOL, Fleet
+
+# Camera to run; defaults to the one configured by interactive_setup.py
+CAMERA_ID = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CAMERA_ID
 
 # Logging Configuration
 LOG_FILE = "dahua_daynight.log"
 LOG_LEVEL = logging.INFO
 
-def load_configuration():
-    """Load configuration from file"""
-    if not os.path.exists(CONFIG_FILE):
+def load_configuration(camera_id=CAMERA_ID):
+    """Load configuration for a single camera from the config store"""
+    if not config_exists():
         print("ERROR: Configuration file not found!")
         print("Please run 'interactive_setup.py' first to configure your camera.")
         sys.exit(1)
     
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            config = json.load(f)
-        
-        # Extract configuration values
-        camera_config = config['camera']
-        location_config = config['location']
-        offsets = config.get('offsets', {'sunrise': 0, 'sunset': 0})
-        profiles = config.get('profiles', {'day': 0, 'night': 1})
-        
-        # Store location info as plain dict (converted to namespace later)
-        location = {
-            'name': location_config['name'],
-            'timezone': location_config['timezone'],
-            'latitude': location_config['latitude'],
-            'longitude': location_config['longitude']
-        }
-        
-        return {
-            'camera_ip': camera_config['ip'],
-            'camera_port': camera_config.get('port', 80),
-            'username': camera_config['username'],
-            'password': camera_config['password'],
-            'location': location,
-            'sunrise_offset': offsets['sunrise'],
-            'sunset_offset': offsets['sunset'],
-            'day_profile': profiles['day'],
-            'night_profile': profiles['night']
-        }
+        # Only this camera's entry is read and validated; the rest of the fleet is untouched
+        with open_store() as store:
+            return store.get_camera(camera_id)
     
     except Exception as e:
         print(f"ERROR: Failed to load configuration: {str(e)}")
         print("Please run 'interactive_setup.py' to reconfigure.")
         sys.exit(1)
 
-# Load configuration at startup
-config = load_configuration()
-
-# Extract configuration values
-CAMERA_IP = config['camera_ip']
-CAMERA_PORT = config['camera_port']
-USERNAME = config['username']
-PASSWORD = config['password']
-# Turn location dict into SimpleNamespace so we can use dot notation
-LOCATION = SimpleNamespace(**config['location'])
-SUNRISE_OFFSET = config['sunrise_offset']
-SUNSET_OFFSET = config['sunset_offset']
-DAY_PROFILE = config['day_profile']
-NIGHT_PROFILE = config['night_profile']
-
-# Setup logging
+# Setup logging before loading the configuration so migration notices reach the log file
 logging.basicConfig(
     level=LOG_LEVEL,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -93,26 +51,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Load configuration at startup
+config = load_configuration()
+
+# Keep the camera as a compact fleet record; its site caches the daily sun times
+FLEET = Fleet()
+CAMERA = FLEET.add_camera(
+    config['camera_ip'], config['camera_port'], config['username'], config['password'],
+    config['location'], config['sunrise_offset'], config['sunset_offset'],
+    config['day_profile'], config['night_profile'], config['camera_channel'],
+)
+
 
 class DahuaCameraController:
     """Controller for Dahua camera day/night mode switching"""
-    
-    def __init__(self, ip, port, username, password):
-        self.ip = ip
-        self.port = port
-        self.username = username
-        self.password = password
-        self.base_url = f"http://{ip}:{port}"
-        self.auth = HTTPDigestAuth(username, password)
-        self.session = requests.Session()
-        self.session.auth = self.auth
-        # Detect firmware once at start; useful for debugging / conditional logic
-        self.firmware_info = self._detect_firmware()
-        if self.firmware_info:
-            logger.info(f"Camera firmware: {self.firmware_info}")
+
+    __slots__ = ('record', 'session')
+
+    def __init__(self, record, session=None):
+        # Settings, endpoint URLs and channel all come from the fleet record
+        self.record = record
+        # Controllers created in this process for the same host/NVR share one session
+        if session is None:
+            session = SESSION_POOL.get(record.ip, record.port, record.username, record.password)
+        self.session = session
+        # Detect firmware once at start; logged for debugging rather than kept per camera
+        firmware_info = self._detect_firmware()
+        if firmware_info:
+            logger.info(f"Camera firmware: {firmware_info}")
         else:
             logger.warning("Could not determine firmware version; proceeding with default endpoints")
 
+    @property
+    def base_url(self):
+        return self.record.base_url
+
     def test_connection(self):
         """Test connection to the camera"""
         try:
@@ -173,12 +146,7 @@ class DahuaCameraController:
     
     def switch_to_day_mode(self):
         """Switch camera to day mode with fallback endpoints"""
-        endpoints = [
-            f"{self.base_url}/cgi-bin/configManager.cgi?action=setConfig&VideoInMode[0].Config[0]={DAY_PROFILE}",
-            f"{self.base_url}/cgi-bin/configManager.cgi?action=setConfig&VideoInOptions[0].NightOptions.SwitchMode=0",
-            f"{self.base_url}/cgi-bin/configManager.cgi?action=setConfig&Camera.Param[0].DayNightColor=1",
-        ]
-        if self._try_endpoints(endpoints):
+        if self._try_endpoints(self.record.day_mode_urls()):
             logger.info("Successfully switched to DAY mode (primary/fallback endpoint)")
             return True
         logger.error("All DAY-mode endpoints failed")
@@ -186,46 +154,28 @@ class DahuaCameraController:
     
     def switch_to_night_mode(self):
         """Switch camera to night mode with fallback endpoints"""
-        endpoints = [
-            f"{self.base_url}/cgi-bin/configManager.cgi?action=setConfig&VideoInMode[0].Config[0]={NIGHT_PROFILE}",
-            f"{self.base_url}/cgi-bin/configManager.cgi?action=setConfig&VideoInOptions[0].NightOptions.SwitchMode=1",
-            f"{self.base_url}/cgi-bin/configManager.cgi?action=setConfig&Camera.Param[0].DayNightColor=2",
-        ]
-        if self._try_endpoints(endpoints):
+        if self._try_endpoints(self.record.night_mode_urls()):
             logger.info("Successfully switched to NIGHT mode (primary/fallback endpoint)")
             return True
         logger.error("All NIGHT-mode endpoints failed")
         return False
 
 
-def get_sun_times():
-    """Get today's sunrise and sunset times for Denver"""
+def get_sun_times(record):
+    """Get today's sunrise and sunset times for a camera's site"""
     pytz = importlib.import_module("pytz")
-    tz = pytz.timezone(LOCATION.timezone)
+    tz = pytz.timezone(record.site.timezone)
     today = datetime.now(tz).date()
 
-    suntime_mod = importlib.import_module("suntime")
-    Sun = getattr(suntime_mod, "Sun")
-    SunTimeException = getattr(suntime_mod, "SunTimeException")
-    sun = Sun(LOCATION.latitude, LOCATION.longitude)
-    try:
-        sunrise = sun.get_local_sunrise_time(today) + timedelta(minutes=SUNRISE_OFFSET)
-        sunset = sun.get_local_sunset_time(today) + timedelta(minutes=SUNSET_OFFSET)
-    except SunTimeException as exc:
-        logger.error(f"Error calculating sunrise/sunset: {exc}")
-        # Fallback: don't adjust
-        sunrise = tz.localize(datetime(today.year, today.month, today.day, 6, 0))
-        sunset = tz.localize(datetime(today.year, today.month, today.day, 18, 0))
-    
-    return sunrise, sunset
+    return FLEET.sun_times(record, today)
 
 
 def check_and_switch_mode(camera):
     """Check current time and switch camera mode if necessary"""
     pytz = importlib.import_module("pytz")
-    tz = pytz.timezone(LOCATION.timezone)
+    tz = pytz.timezone(camera.record.site.timezone)
     now = datetime.now(tz)
-    sunrise, sunset = get_sun_times()
+    sunrise, sunset = get_sun_times(camera.record)
     
     logger.debug(f"Current time: {now}")
     logger.debug(f"Sunrise: {sunrise}, Sunset: {sunset}")
@@ -243,9 +193,9 @@ def check_and_switch_mode(camera):
 
 def schedule_daily_switches(camera):
     """Schedule the camera switches for today"""
-    sunrise, sunset = get_sun_times()
+    sunrise, sunset = get_sun_times(camera.record)
     pytz = importlib.import_module("pytz")
-    tz = pytz.timezone(LOCATION.timezone)
+    tz = pytz.timezone(camera.record.site.timezone)
     now = datetime.now(tz)
     
     # Clear existing scheduled jobs
@@ -272,12 +222,12 @@ def main():
     """Main function to run the camera controller"""
     logger.info("=" * 50)
     logger.info("Starting Dahua Camera Day/Night Automation")
-    logger.info(f"Location: {LOCATION.name}")
-    logger.info(f"Camera: {CAMERA_IP}:{CAMERA_PORT}")
+    logger.info(f"Location: {CAMERA.site.name}")
+    logger.info(f"Camera: {CAMERA_ID} ({CAMERA.ip}:{CAMERA.port}, channel {CAMERA.channel})")
     logger.info("=" * 50)
     
     # Initialize camera controller
-    camera = DahuaCameraController(CAMERA_IP, CAMERA_PORT, USERNAME, PASSWORD)
+    camera = DahuaCameraController(CAMERA)
     
     # Test connection
     if not camera.test_connection():
@@ -285,7 +235,7 @@ def main():
         sys.exit(1)
     
     # Get and display sun times
-    sunrise, sunset = get_sun_times()
+    sunrise, sunset = get_sun_times(CAMERA)
     logger.info(f"Today's sunrise: {sunrise.strftime('%H:%M:%S %Z')}")
     logger.info(f"Today's sunset: {sunset.strftime('%H:%M:%S %Z')}")
     
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# pyright: ignore-all
+# mypy: ignore-missing-imports
+# pylint: disable=import-error
+"""
+Compact Fleet Model for Dahua Day/Night Automation
+Keeps per-camera memory small so large fleets (10,000+ cameras) fit comfortably
+"""
+
+import sys
+import logging
+import importlib
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+class Site:
+    """A physical location shared by one or more cameras"""
+
+    __slots__ = ('name', 'timezone', 'latitude', 'longitude')
+
+    def __init__(self, name, timezone, latitude, longitude):
+        self.name = sys.intern(name)
+        self.timezone = sys.intern(timezone)
+        self.latitude = latitude
+        self.longitude = longitude
+
+
+def site_key(name, timezone, latitude, longitude):
+    """Identity used to deduplicate sites across cameras"""
+    return (name, timezone, round(latitude, 4), round(longitude, 4))
+
+
+class CameraRecord:
+    """Minimal per-camera state; URLs, auth and sessions are derived on demand"""
+
+    __slots__ = ('ip', 'port', 'channel', 'username', 'password', 'site',
+                 'sunrise_offset', 'sunset_offset', 'day_profile', 'night_profile')
+
+    def __init__(self, ip, port, username, password, site,
+                 sunrise_offset=0, sunset_offset=0, day_profile=0, night_profile=1, channel=0):
+        # Cameras behind one NVR share ip:port and differ only by channel
+        self.ip = sys.intern(ip)
+        self.port = port
+        self.channel = channel
+        # Fleets typically reuse a handful of usernames; intern so each is stored once
+        self.username = sys.intern(username)
+        self.password = password
+        self.site = site
+        self.sunrise_offset = sunrise_offset
+        self.sunset_offset = sunset_offset
+        self.day_profile = day_profile
+        self.night_profile = night_profile
+
+    @property
+    def base_url(self):
+        return f"http://{self.ip}:{self.port}"
+
+    def day_mode_urls(self):
+        """Day-mode endpoints in fallback order"""
+        base, ch = self.base_url, self.channel
+        return [
+            f"{base}/cgi-bin/configManager.cgi?action=setConfig&VideoInMode[{ch}].Config[0]={self.day_profile}",
+            f"{base}/cgi-bin/configManager.cgi?action=setConfig&VideoInOptions[{ch}].NightOptions.SwitchMode=0",
+            f"{base}/cgi-bin/configManager.cgi?action=setConfig&Camera.Param[{ch}].DayNightColor=1",
+        ]
+
+    def night_mode_urls(self):
+        """Night-mode endpoints in fallback order"""
+        base, ch = self.base_url, self.channel
+        return [
+            f"{base}/cgi-bin/configManager.cgi?action=setConfig&VideoInMode[{ch}].Config[0]={self.night_profile}",
+            f"{base}/cgi-bin/configManager.cgi?action=setConfig&VideoInOptions[{ch}].NightOptions.SwitchMode=1",
+            f"{base}/cgi-bin/configManager.cgi?action=setConfig&Camera.Param[{ch}].DayNightColor=2",
+        ]
+
+
+class SessionPool:
+    """Share one HTTP session per host/NVR and credential pair"""
+
+    def __init__(self):
+        self._sessions = {}
+
+    def get(self, ip, port, username, password):
+        key = (ip, port, username, password)
+        session = self._sessions.get(key)
+        if session is None:
+            requests = importlib.import_module("requests")
+            auth_mod = importlib.import_module("requests.auth")
+            session = requests.Session()
+            session.auth = auth_mod.HTTPDigestAuth(username, password)
+            self._sessions[key] = session
+        return session
+
+    def close(self):
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+# Process-wide pool so controllers created in one process for the same host reuse a connection
+SESSION_POOL = SessionPool()
+
+
+def compute_sun_times(site, day):
+    """Calculate raw (un-offset) sunrise and sunset for a site on a given date
+
+    Returns (sunrise, sunset, calculated); `calculated` is False when the fixed
+    06:00/18:00 fallback was used.
+    """
+    pytz = importlib.import_module("pytz")
+    tz = pytz.timezone(site.timezone)
+
+    suntime_mod = importlib.import_module("suntime")
+    Sun = getattr(suntime_mod, "Sun")
+    SunTimeException = getattr(suntime_mod, "SunTimeException")
+    sun = Sun(site.latitude, site.longitude)
+    try:
+        sunrise = sun.get_local_sunrise_time(day)
+        sunset = sun.get_local_sunset_time(day)
+        calculated = True
+    except SunTimeException as exc:
+        logger.error(f"Error calculating sunrise/sunset: {exc}")
+        # Fallback: fixed 06:00 / 18:00 local time
+        sunrise = tz.localize(datetime(day.year, day.month, day.day, 6, 0))
+        sunset = tz.localize(datetime(day.year, day.month, day.day, 18, 0))
+        calculated = False
+    return sunrise, sunset, calculated
+
+
+def offset_sun_times(times, sunrise_offset, sunset_offset):
+    """Apply minute offsets to the result of compute_sun_times"""
+    sunrise, sunset, calculated = times
+    if not calculated:
+        # Fallback: don't adjust
+        return sunrise, sunset
+    return (sunrise + timedelta(minutes=sunrise_offset),
+            sunset + timedelta(minutes=sunset_offset))
+
+
+class Fleet:
+    """Collection of cameras with sites and sun times deduplicated"""
+
+    def __init__(self):
+        self.cameras = []
+        self._sites = {}
+        self._sun_cache = {}
+
+    def __len__(self):
+        return len(self.cameras)
+
+    def __iter__(self):
+        return iter(self.cameras)
+
+    @property
+    def sites(self):
+        return list(self._sites.values())
+
+    def get_site(self, name, timezone, latitude, longitude):
+        """Return the shared Site for this location, creating it if needed"""
+        key = site_key(name, timezone, latitude, longitude)
+        site = self._sites.get(key)
+        if site is None:
+            site = Site(name, timezone, latitude, longitude)
+            self._sites[key] = site
+        return site
+
+    def add_camera(self, ip, port, username, password, location,
+                   sunrise_offset=0, sunset_offset=0, day_profile=0, night_profile=1, channel=0):
+        """Add a camera; `location` is a dict with name/timezone/latitude/longitude"""
+        site = self.get_site(location['name'], location['timezone'],
+                             location['latitude'], location['longitude'])
+        camera = CameraRecord(ip, port, username, password, site,
+                              sunrise_offset, sunset_offset, day_profile, night_profile, channel)
+        self.cameras.append(camera)
+        return camera
+
+    def site_sun_times(self, site, day):
+        """Raw sunrise/sunset for a site, computed once per site per day"""
+        # One entry per site, replaced when that site's local day changes
+        cached = self._sun_cache.get(site)
+        if cached is None or cached[0] != day:
+            cached = (day, compute_sun_times(site, day))
+            self._sun_cache[site] = cached
+        return cached[1]
+
+    def sun_times(self, camera, day):
+        """Sunrise/sunset for a camera with its own offsets applied"""
+        return offset_sun_times(self.site_sun_times(camera.site, day),
+                                camera.sunrise_offset, camera.sunset_offset)
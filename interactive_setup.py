@@ -9,13 +9,12 @@ Interactive Setup Script for Dahua Camera Day/Night Switcher
 This script helps non-technical users configure their camera settings
 """
 
-import json
 import os
 import sys
 import getpass
 import importlib
 
-CONFIG_FILE = "camera_config.json"
+from config_store import DEFAULT_CAMERA_ID, config_exists, open_store
 
 def clear_screen():
     """Clear the console screen"""
@@ -267,11 +266,11 @@ def get_advanced_settings():
         'sunset_offset': sunset_offset
     }
 
-def save_configuration(config):
-    """Save configuration to file"""
+def save_configuration(config, camera_id=DEFAULT_CAMERA_ID):
+    """Save one camera's configuration; other cameras in the store are left as-is"""
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
+        with open_store() as store:
+            store.put_camera(camera_id, config)
         return True
     except Exception as e:
         print(f"Error saving configuration: {str(e)}")
@@ -291,7 +290,7 @@ def main():
     input("Press Enter to continue...")
     
     # Check if config already exists
-    if os.path.exists(CONFIG_FILE):
+    if config_exists():
         print_header()
         print("An existing configuration was found.")
         overwrite = input("Do you want to create a new configuration? (yes/no): ").strip().lower()
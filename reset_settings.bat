@@ -18,6 +18,7 @@ if errorlevel 2 (
 echo.
 echo Deleting configuration...
 
+if exist camera_config.db del camera_config.db
 if exist camera_config.json del camera_config.json
 if exist dahua_daynight.log del dahua_daynight.log
 
@@ -6,7 +6,7 @@ echo ======================================\necho  Dahua Camera Automation \nech
 echo.
 
 REM Check if configuration exists
-if not exist camera_config.json (
+if not exist camera_config.db if not exist camera_config.json (
     echo ERROR: No configuration found!
     echo.
     echo Please run "START_HERE.bat" first to configure your camera.